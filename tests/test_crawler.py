@@ -41,3 +41,77 @@ async def test_crawl_site():
                 
                 assert "https://example.com/page1" in result
 
+
+@pytest.mark.asyncio
+async def test_crawl_site_skips_duplicates():
+    from trie_search.dedup import DuplicateDetector
+    mock_client = AsyncMock()
+
+    with patch('trie_search.crawler.fetch_html', new_callable=AsyncMock) as mock_fetch:
+        mock_fetch.return_value = '<html></html>'
+        with patch('trie_search.crawler.get_links') as mock_get_links:
+            mock_get_links.return_value = ["https://example.com/print"]
+            with patch('trie_search.crawler.get_text') as mock_get_text:
+                # both pages have the same content
+                mock_get_text.return_value = "hello world from the same page"
+
+                detector = DuplicateDetector()
+                result = await crawl_site("https://example.com", 1, mock_client, detector=detector)
+
+                assert list(result) == ["https://example.com"]
+                assert detector.aliases == {"https://example.com/print": "https://example.com"}
+
+@pytest.mark.asyncio
+async def test_build_index_records_aliases():
+    pages = {
+        "https://example.com": "welcome to the example home page",
+        "https://example.com/print": "welcome to the example home page",
+        "https://example.com/about": "about us contact team",
+    }
+
+    async def fake_fetch(client, url):
+        return url
+
+    with patch('trie_search.crawler.fetch_html', new=fake_fetch):
+        with patch('trie_search.crawler.get_links') as mock_get_links:
+            mock_get_links.side_effect = lambda html, url: list(pages) if url == "https://example.com" else []
+            with patch('trie_search.crawler.get_text', side_effect=pages.get):
+                aliases = {}
+                t = await build_index_async("https://example.com", 1, aliases)
+
+                assert aliases == {"https://example.com/print": "https://example.com"}
+                assert t["welcome"] == {"https://example.com"}
+                assert t["about"] == {"https://example.com/about"}
+
+@pytest.mark.asyncio
+async def test_build_index_merges_duplicate_words():
+    shared = "welcome to the example home page site " * 20
+    pages = {
+        "https://example.com/?session=1": shared + "special",
+        "https://example.com/": shared,
+        "https://example.com/?print=1": shared,
+    }
+
+    async def fake_fetch(client, url):
+        return url
+
+    with patch('trie_search.crawler.fetch_html', new=fake_fetch):
+        with patch('trie_search.crawler.get_links') as mock_get_links:
+            mock_get_links.side_effect = lambda html, url: list(pages) if url == "https://example.com/?session=1" else []
+            with patch('trie_search.crawler.get_text', side_effect=pages.get):
+                aliases = {}
+                t = await build_index_async("https://example.com/?session=1", 1, aliases)
+
+                # the shortest URL is canonical, whichever page was crawled first
+                assert aliases == {
+                    "https://example.com/?session=1": "https://example.com/",
+                    "https://example.com/?print=1": "https://example.com/",
+                }
+                # words only a duplicate had are still indexed
+                assert t["special"] == {"https://example.com/"}
+                assert t["welcome"] == {"https://example.com/"}
+
+                aliases = {}
+                t = await build_index_async("https://example.com/?session=1", 1, aliases, dedup_distance=None)
+                assert aliases == {}
+                assert t["welcome"] == set(pages)
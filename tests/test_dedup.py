@@ -0,0 +1,24 @@
+from trie_search.dedup import DuplicateDetector, simhash, hamming_distance
+
+def test_simhash_near_duplicates():
+    words = ("the quick brown fox jumps over the lazy dog " * 20).split()
+    words += "lorem ipsum dolor sit amet consectetur adipiscing elit".split()
+    variant = words + ["page"]
+
+    assert simhash(words) == simhash(list(reversed(words)))
+    assert hamming_distance(simhash(words), simhash(variant)) <= 3
+    assert hamming_distance(simhash(words), simhash("completely unrelated content here".split())) > 3
+
+def test_detector_records_aliases():
+    detector = DuplicateDetector()
+    words = "apple banana cherry date elderberry fig grape".split() * 5
+
+    assert detector.check("https://example.com/a", words) is None
+    assert detector.check("https://example.com/a?print=1", words) == "https://example.com/a"
+    assert detector.check("https://example.com/b", "totally different words".split()) is None
+    assert detector.check("https://example.com/empty", []) is None
+
+    assert detector.aliases == {"https://example.com/a?print=1": "https://example.com/a"}
+    assert detector.pages_seen == 4
+    assert detector.postings_skipped == 7
+    assert "Skipped 1/4 pages" in detector.report()
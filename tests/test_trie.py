@@ -1,3 +1,4 @@
+import pytest
 from trie_search.trie import Trie
 
 def test_trie_basic_operations():
@@ -50,3 +51,44 @@ def test_trie_autocomplete():
     
     results = t.autocomplete("z")
     assert len(results) == 0
+
+def test_trie_wildcard_search_after():
+    t = Trie()
+    for word in ["cat", "cot", "cut", "ca", "cab", "dog"]:
+        t[word] = word
+
+    assert [k for k, _ in t.wildcard_search("c*t")] == ["cat", "cot", "cut"]
+    assert [k for k, _ in t.wildcard_search("c*t", after="cat")] == ["cot", "cut"]
+    assert [k for k, _ in t.wildcard_search("c*t", after="cb")] == ["cot", "cut"]
+    assert [k for k, _ in t.wildcard_search("c*t", after="cut")] == []
+    assert [k for k, _ in t.wildcard_search("***", after="ca")] == ["cab", "cat", "cot", "cut", "dog"]
+
+def test_trie_subtree_counts():
+    t = Trie()
+    words = ["app", "apple", "application", "apply", "banana", "band", "can"]
+    for word in words:
+        t[word] = word
+    t["apple"] = "again"
+
+    assert t.count_prefix("") == 7
+    assert t.count_prefix("app") == 4
+    assert t.count_prefix("appl") == 3
+    assert t.count_prefix("ban") == 2
+    assert t.count_prefix("z") == 0
+
+    assert [t.select(i)[0] for i in range(len(t))] == words
+    assert t.select(1) == ("apple", "again")
+    assert [t.rank(word) for word in words] == list(range(len(words)))
+    assert t.rank("a") == 0
+    assert t.rank("apricot") == 4
+    assert t.rank("zebra") == 7
+
+    del t["apple"]
+    del t["band"]
+    assert t.count_prefix("app") == 3
+    assert t.count_prefix("ban") == 1
+    assert t.select(1)[0] == "application"
+    assert t.rank("can") == 4
+
+    with pytest.raises(IndexError):
+        t.select(5)
@@ -9,12 +9,14 @@ def client():
     import trie_search.web
     # Set search_trie to a dummy value to prevent initialize_app from starting a build
     trie_search.web.search_trie = MagicMock() 
+    trie_search.web.page_aliases = {}
     trie_search.web.is_building = False
     trie_search.web.build_status = "Ready"
     # Reset config to defaults for testing
     trie_search.web.current_config = {
         "url": "https://example.com",
-        "depth": 2
+        "depth": 2,
+        "dedup_distance": 3
     }
     
     with app.test_client() as client:
@@ -55,6 +57,17 @@ def test_post_config(mock_thread, client):
     mock_thread.assert_called_once()
     mock_thread_instance.start.assert_called_once()
 
+@patch('trie_search.web.threading.Thread')
+def test_post_config_dedup(mock_thread, client):
+    """Test turning near-duplicate detection off and rejecting bad thresholds."""
+    response = client.post('/api/config', json={"url": "https://example.com", "dedup_distance": None})
+    assert response.status_code == 200
+    assert response.get_json()['config']['dedup_distance'] is None
+    assert mock_thread.call_args.kwargs['args'] == ("https://example.com", 2, None)
+
+    response = client.post('/api/config', json={"url": "https://example.com", "dedup_distance": 5})
+    assert response.status_code == 400
+
 def test_search_empty(client):
     """Test search with empty query."""
     response = client.get('/search?query=')
@@ -66,3 +79,135 @@ def test_autocomplete_empty(client):
     response = client.get('/autocomplete?q=')
     assert response.status_code == 200
     assert response.get_json() == []
+
+def test_search_pagination(client):
+    """Test streamed search results with limit and cursor."""
+    import trie_search.web
+    from trie_search.trie import Trie
+    t = Trie()
+    for word in ["cat", "cot", "cut", "dog"]:
+        t[word] = {"https://example.com/b", "https://example.com/a"}
+    trie_search.web.search_trie = t
+
+    response = client.get('/search?query=c*t')
+    assert [item["word"] for item in response.get_json()] == ["cat", "cot", "cut"]
+    assert response.get_json()[0]["urls"] == ["https://example.com/a", "https://example.com/b"]
+
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get('/search?query=c*t&limit=2')
+    assert [item["word"] for item in response.get_json()] == ["cat", "cot"]
+    assert response.headers["X-Next-Cursor"] == "cot"
+
+    response = client.get('/search?query=c*t&limit=2&cursor=cot')
+    assert [item["word"] for item in response.get_json()] == ["cut"]
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get('/search?query=c*t&limit=3')
+    assert len(response.get_json()) == 3
+    assert "X-Next-Cursor" not in response.headers
+
+    response = client.get('/search?query=c*t&limit=-1')
+    assert response.status_code == 400
+
+def test_autocomplete_offset(client):
+    """Test autocomplete pages and total count."""
+    import trie_search.web
+    from trie_search.trie import Trie
+    t = Trie()
+    words = ["pre" + chr(97 + i) for i in range(15)] + ["print", "zoo"]
+    for word in words:
+        t[word] = {"https://example.com"}
+    trie_search.web.search_trie = t
+
+    response = client.get('/autocomplete?q=pre')
+    assert response.get_json() == words[:10]
+    assert response.headers["X-Total-Count"] == "15"
+
+    response = client.get('/autocomplete?q=pre&offset=10')
+    assert response.get_json() == words[10:15]
+
+    response = client.get('/autocomplete?q=pre&offset=15')
+    assert response.get_json() == []
+    assert response.headers["X-Total-Count"] == "15"
+
+    response = client.get('/autocomplete?q=qu')
+    assert response.get_json() == []
+    assert response.headers["X-Total-Count"] == "0"
+
+    assert client.get('/autocomplete?q=pre&offset=abc').status_code == 400
+    assert client.get('/autocomplete?q=pre&offset=1.5').status_code == 400
+    assert client.get('/autocomplete?q=pre&offset=-1').status_code == 400
+
+    response = client.get('/search?query=pr**')
+    assert response.headers["X-Result-Estimate"] == "16"
+
+    response = client.get('/search?query=*r**')
+    assert "X-Result-Estimate" not in response.headers
+
+def test_aliases(client):
+    """Test looking up the canonical page of a near-duplicate URL."""
+    import trie_search.web
+    trie_search.web.page_aliases = {"https://example.com/print": "https://example.com"}
+
+    response = client.get('/api/aliases')
+    assert response.get_json() == {"https://example.com/print": "https://example.com"}
+
+    response = client.get('/api/aliases?url=https://example.com/print')
+    assert response.get_json()["canonical"] == "https://example.com"
+
+    response = client.get('/api/aliases?url=https://example.com/about')
+    assert response.get_json()["canonical"] == "https://example.com/about"
+
+def test_search_limit_validation(client):
+    """Test that malformed limits are rejected and large ones are capped."""
+    import trie_search.web
+    from trie_search.trie import Trie
+    t = Trie()
+    for i in range(150):
+        t["w" + chr(97 + i // 26) + chr(97 + i % 26)] = {"https://example.com"}
+    trie_search.web.search_trie = t
+
+    assert client.get('/search?query=w**&limit=abc').status_code == 400
+    assert client.get('/search?query=w**&limit=1.5').status_code == 400
+    assert len(client.get('/search?query=w**').get_json()) == 100
+    with patch('trie_search.web.MAX_PAGE_SIZE', 120):
+        assert len(client.get('/search?query=w**&limit=5000').get_json()) == 120
+
+def test_autocomplete_keeps_prefix(client):
+    """Test that autocomplete echoes the prefix as the user typed it."""
+    import trie_search.web
+    from trie_search.trie import Trie
+    t = Trie()
+    t["prea"] = {"https://example.com"}
+    t["co_op"] = {"https://example.com"}
+    trie_search.web.search_trie = t
+
+    assert client.get('/autocomplete?q=PRE').get_json() == ["PREa"]
+    assert client.get('/autocomplete?q=co-').get_json() == ["co-op"]
+
+def test_search_pages_cover_all_results(client):
+    """Test that following X-Next-Cursor, as the frontend does, reaches every match."""
+    import trie_search.web
+    from trie_search.trie import Trie
+    t = Trie()
+    words = ["w" + chr(97 + i // 26) + chr(97 + i % 26) for i in range(250)]
+    for word in words:
+        t[word] = {"https://example.com"}
+    trie_search.web.search_trie = t
+
+    seen = []
+    url = '/search?query=w**'
+    while True:
+        response = client.get(url)
+        seen += [item["word"] for item in response.get_json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+        url = f'/search?query=w**&cursor={cursor}'
+    assert seen == words
+
+    # the page relies on the header to offer the remaining results
+    page = client.get('/').get_data(as_text=True)
+    assert "X-Next-Cursor" in page
+    assert 'id="load-more-btn"' in page
@@ -1,11 +1,12 @@
 from .utils import get_links, get_text, fetch_html, ALLOWED_DOMAINS
 from .trie import Trie
+from .dedup import DuplicateDetector
 import re
 import asyncio
 import httpx
     
 
-async def crawl_site(start_url: str, max_depth: int, client: httpx.AsyncClient, visited: set[str]| None = None) -> dict[str, list[str]]:
+async def crawl_site(start_url: str, max_depth: int, client: httpx.AsyncClient, visited: set[str]| None = None, detector: DuplicateDetector | None = None) -> dict[str, list[str]]:
     """
     Given a starting URL, return a mapping of URLs mapped to words that appeared on that page.·
 
@@ -15,6 +16,8 @@ async def crawl_site(start_url: str, max_depth: int, client: httpx.AsyncClient,
                     Links from the start page would be depth=1, links from those depth=2, and so on.
         client    - httpx.AsyncClient for making requests.
         visited   - Set of visited URLs to prevent loops.
+        detector  - Optional DuplicateDetector; near-duplicate pages are recorded
+                    as aliases in it and left out of the result.
 
     Returns:
         Dictionary mapping strings to lists of strings.
@@ -36,7 +39,12 @@ async def crawl_site(start_url: str, max_depth: int, client: httpx.AsyncClient,
         return {}
     
     # extract words from HTML using regex
-    result = {start_url: re.findall(r'[a-zA-Z]+', get_text(html))}
+    words = re.findall(r'[a-zA-Z]+', get_text(html))
+    # skip indexing pages that are near-duplicates of one already crawled
+    if detector is not None and detector.check(start_url, words) is not None:
+        result = {}
+    else:
+        result = {start_url: words}
     # if max depth is 0, return only the starting page
     if max_depth <= 0:
         print(f"Crawled: {start_url}")
@@ -47,7 +55,7 @@ async def crawl_site(start_url: str, max_depth: int, client: httpx.AsyncClient,
     for link in links:
         if link.startswith(ALLOWED_DOMAINS) and link not in visited:
             # recursively crawl linked page with decremented depth
-            tasks.append(crawl_site(link, max_depth - 1, client, visited))
+            tasks.append(crawl_site(link, max_depth - 1, client, visited, detector))
     
     if tasks:
         sub_results = await asyncio.gather(*tasks)
@@ -63,7 +71,7 @@ def _merge_results(main_result: dict[str, list[str]], sub_results: list[dict[str
                 main_result[url] = words
 
 
-async def build_index_async(site_url: str, max_depth: int) -> Trie:
+async def build_index_async(site_url: str, max_depth: int, aliases: dict[str, str] | None = None, dedup_distance: int | None = 3) -> Trie:
     """
     Given a starting URL, build a `Trie` of all words seen mapped to
     the page(s) they appeared upon.
@@ -71,6 +79,10 @@ async def build_index_async(site_url: str, max_depth: int) -> Trie:
     Parameters:
         site_url - URL of page to start crawl on.
         max_depth - Maximum link depth into site to visit.
+        aliases   - Optional dictionary filled with near-duplicate URLs mapped to
+                    the canonical URL they were indexed under.
+        dedup_distance - Maximum number of differing fingerprint bits for two pages
+                    to count as near-duplicates (0-3), or None to index every page.
 
     Returns:
         `Trie` where the keys are words seen on the crawl, and the
@@ -78,9 +90,17 @@ async def build_index_async(site_url: str, max_depth: int) -> Trie:
         appeared on.
     """
     t = Trie()
+    detector = DuplicateDetector(dedup_distance) if dedup_distance is not None else None
     async with httpx.AsyncClient() as client:
         # crawl the site to get mapping of URLs to words
-        site_data = await crawl_site(site_url, max_depth, client)
+        site_data = await crawl_site(site_url, max_depth, client, detector=detector)
+    
+    if detector is not None:
+        # merge duplicates into their canonical page before indexing
+        detector.resolve(site_data)
+        print(detector.report())
+        if aliases is not None:
+            aliases.update(detector.aliases)
     
     for url, words in site_data.items():
         for word in words:
@@ -100,8 +120,8 @@ async def build_index_async(site_url: str, max_depth: int) -> Trie:
     return t
 
 
-def build_index(site_url: str, max_depth: int) -> Trie:
+def build_index(site_url: str, max_depth: int, aliases: dict[str, str] | None = None, dedup_distance: int | None = 3) -> Trie:
     """
     Synchronous wrapper for build_index_async.
     """
-    return asyncio.run(build_index_async(site_url, max_depth))
+    return asyncio.run(build_index_async(site_url, max_depth, aliases, dedup_distance))
@@ -0,0 +1,191 @@
+from typing import Iterable
+from collections import Counter
+import hashlib
+
+
+FINGERPRINT_BITS = 64
+
+
+# width of each per-bit counter packed into a single integer by `_token_lanes`
+LANE_BITS = 32
+LANE_MASK = (1 << LANE_BITS) - 1
+
+
+def _token_lanes(token: str) -> int:
+    """
+    Given a token, return its stable 64-bit hash spread out so that bit `i`
+    of the hash becomes the lowest bit of lane `i` (`LANE_BITS` wide).
+
+    Python's built-in `hash` is salted per process, so a fixed digest is
+    used instead to keep fingerprints reproducible between runs.
+    """
+    digest = hashlib.blake2b(token.encode("utf-8"), digest_size=8).digest()
+    h = int.from_bytes(digest, "big")
+    lanes = 0
+    for bit in range(FINGERPRINT_BITS):
+        if h >> bit & 1:
+            lanes |= 1 << (bit * LANE_BITS)
+    return lanes
+
+
+def simhash(words: list[str], cache: dict[str, int] | None = None) -> int:
+    """
+    Given the token stream of a page, return its 64-bit SimHash fingerprint.
+
+    Each distinct (lowercased) token votes on every bit of the fingerprint,
+    weighted by how often it appears on the page. Pages sharing most of their
+    tokens end up with fingerprints that differ in only a few bits.
+
+    `cache` optionally maps tokens to their `_token_lanes` value, so words
+    recurring across the pages of a site are only hashed once.
+    """
+    if cache is None:
+        cache = {}
+    # a token votes +count on its set bits and -count on the rest, so only the
+    # set bits are counted and compared against half the total at the end;
+    # all 64 counters are added at once as lanes of one integer
+    packed = 0
+    for token, count in Counter(word.lower() for word in words).items():
+        lanes = cache.get(token)
+        if lanes is None:
+            lanes = cache[token] = _token_lanes(token)
+        packed += count * lanes
+    total = len(words)
+
+    fingerprint = 0
+    for bit in range(FINGERPRINT_BITS):
+        if 2 * (packed >> (bit * LANE_BITS) & LANE_MASK) > total:
+            fingerprint |= 1 << bit
+    return fingerprint
+
+
+def hamming_distance(a: int, b: int) -> int:
+    """
+    Return the number of bits that differ between two fingerprints.
+    """
+    return bin(a ^ b).count("1")
+
+
+class DuplicateDetector:
+    """
+    Detects near-duplicate pages during a crawl using SimHash fingerprints.
+
+    Fingerprints are split into `bands` equal slices and bucketed by each
+    slice (LSH). Two fingerprints within `max_distance` bits of each other
+    are guaranteed to share at least one slice as long as
+    `max_distance < bands`, so only pages in a shared bucket are compared.
+    """
+    def __init__(self, max_distance: int = 3, bands: int = 4):
+        if not 0 <= max_distance < bands or FINGERPRINT_BITS % bands:
+            raise ValueError("max_distance must be below bands, and bands must divide 64")
+        self.max_distance = max_distance
+        self.bands = bands
+        self.band_bits = FINGERPRINT_BITS // bands
+        self.buckets: list[dict[int, list[str]]] = [{} for _ in range(bands)]
+        self.fingerprints: dict[str, int] = {}
+        # duplicate URL -> canonical URL it was recognised as a copy of
+        self.aliases: dict[str, str] = {}
+        # distinct words of each duplicate, until merged by `resolve`
+        self.alias_words: dict[str, set[str]] = {}
+        # per-crawl cache for `simhash`, freed along with the detector
+        self.token_cache: dict[str, int] = {}
+        self.pages_seen = 0
+        self.postings_indexed = 0
+        self.postings_skipped = 0
+
+
+    def _bands(self, fingerprint: int) -> Iterable[tuple[int, int]]:
+        """
+        Yield (band index, band value) pairs for a fingerprint.
+        """
+        mask = (1 << self.band_bits) - 1
+        for band in range(self.bands):
+            yield band, fingerprint >> (band * self.band_bits) & mask
+
+
+    def find_canonical(self, fingerprint: int) -> str | None:
+        """
+        Return the URL of an already seen page within `max_distance` bits of
+        `fingerprint`, or None if there is no such page.
+        """
+        for band, value in self._bands(fingerprint):
+            for url in self.buckets[band].get(value, ()):
+                if hamming_distance(fingerprint, self.fingerprints[url]) <= self.max_distance:
+                    return url
+        return None
+
+
+    def check(self, url: str, words: list[str]) -> str | None:
+        """
+        Record a crawled page and decide whether it should be indexed.
+
+        Returns the canonical URL if the page is a near-duplicate of one seen
+        before (the page is then recorded as its alias), otherwise registers
+        the page as canonical and returns None.
+        """
+        self.pages_seen += 1
+        # pages without any words have nothing to index, and would all collide
+        if not words:
+            return None
+
+        distinct = {word.lower() for word in words}
+        fingerprint = simhash(words, self.token_cache)
+        canonical = self.find_canonical(fingerprint)
+        if canonical is not None:
+            self.aliases[url] = canonical
+            self.alias_words[url] = distinct
+            self.postings_skipped += len(distinct)
+            return canonical
+
+        self.fingerprints[url] = fingerprint
+        for band, value in self._bands(fingerprint):
+            self.buckets[band].setdefault(value, []).append(url)
+        self.postings_indexed += len(distinct)
+        return None
+
+
+    def resolve(self, site_data: dict[str, list[str]]) -> None:
+        """
+        Fold each group of near-duplicates in a crawl result into one entry.
+
+        The shortest URL of a group (print views and session variants usually
+        add to the URL) becomes its canonical page, so the choice does not
+        depend on the order pages were fetched in. It is given the union of the
+        group's words, so no word is lost from the index by skipping a page.
+        `site_data` and `aliases` are updated in place.
+        """
+        groups: dict[str, list[str]] = {}
+        for alias, canonical in self.aliases.items():
+            groups.setdefault(canonical, []).append(alias)
+
+        for canonical, members in groups.items():
+            canonical_words = {word.lower() for word in site_data.pop(canonical, [])}
+            words = set(canonical_words)
+            for alias in members:
+                words |= self.alias_words.pop(alias, set())
+            # words only the duplicates had are indexed after all
+            merged = len(words) - len(canonical_words)
+            self.postings_indexed += merged
+            self.postings_skipped -= merged
+
+            members.append(canonical)
+            preferred = min(members, key=lambda url: (len(url), url))
+            site_data[preferred] = list(words)
+            for url in members:
+                if url != preferred:
+                    self.aliases[url] = preferred
+            self.aliases.pop(preferred, None)
+
+
+    def report(self) -> str:
+        """
+        Return a one-line summary of the skip rate and index-size reduction.
+        """
+        skipped = len(self.aliases)
+        skip_rate = skipped / self.pages_seen if self.pages_seen else 0.0
+        total = self.postings_indexed + self.postings_skipped
+        reduction = self.postings_skipped / total if total else 0.0
+        return (
+            f"Skipped {skipped}/{self.pages_seen} pages as near-duplicates ({skip_rate:.1%}), "
+            f"{self.postings_skipped} postings not indexed ({reduction:.1%} smaller index)"
+        )
@@ -40,6 +40,8 @@ class TrieNode:
         self.children: list[TrieNode | None] = [None] * 27
         self.value: Any = None
         self.is_end: bool = False
+        # number of keys stored in this node's subtree, including itself
+        self.count: int = 0
 
 
 class Trie(MutableMapping):
@@ -90,6 +92,7 @@ class Trie(MutableMapping):
             raise KeyError(f"key \"{key}\" must be a string")
         
         node = self.root
+        path = [node]
         for char in key:
             # get index for character
             index = character_to_key(char)
@@ -100,10 +103,13 @@ class Trie(MutableMapping):
                 node.children[index] = child
             # move to child node
             node = child
+            path.append(node)
         
-        # if this is a new key, increment size
+        # if this is a new key, increment size and subtree counts
         if not node.is_end:
             self.size += 1
+            for path_node in path:
+                path_node.count += 1
         # set value and mark as end of key
         node.value = value
         node.is_end = True
@@ -135,6 +141,7 @@ class Trie(MutableMapping):
             # delete the value
             node.is_end = False
             node.value = None
+            node.count -= 1
             self.size -= 1
             # return if the node can be deleted
             return all(child is None for child in node.children)
@@ -142,6 +149,8 @@ class Trie(MutableMapping):
         # the next character in the key
         index = character_to_key(key[depth])
         delete_child = self._delete(node.children[index], key, depth + 1)
+        # the key was found below this node
+        node.count -= 1
         # if the child can be deleted, delete it
         if delete_child:
             node.children[index] = None
@@ -183,7 +192,7 @@ class Trie(MutableMapping):
                 yield from self._traverse(child, prefix + char)
 
 
-    def wildcard_search(self, key: str) -> Iterable[tuple[str, Any]]:
+    def wildcard_search(self, key: str, after: str | None = None) -> Iterable[tuple[str, Any]]:
         """
         Search for keys that match a wildcard pattern where a '*' can represent any character.
 
@@ -191,18 +200,25 @@ class Trie(MutableMapping):
             - c*t would match 'cat', 'cut', 'cot', etc.
             - ** would match any two-letter string.
 
-        Returns: Iterable of (key, value) pairs meeting the given condition.
+        If `after` is given, only keys that come strictly after it in alphabetical order
+        are returned, and the branches before it are skipped without being visited.
+
+        Returns: Iterable of (key, value) pairs meeting the given condition, in alphabetical order.
         """
-        return self._wildcard_traverse(self.root, "", key)
+        return self._wildcard_traverse(self.root, "", key, after)
         
     
-    def _wildcard_traverse(self, node: TrieNode, prefix: str, key: str) -> Iterable[tuple[str, Any]]:
+    def _wildcard_traverse(self, node: TrieNode, prefix: str, key: str, after: str | None = None) -> Iterable[tuple[str, Any]]:
         """
         Helper function to traverse the trie for wildcard search.
+
+        `after` is the part of the cursor key not yet matched by `prefix`,
+        or None once `prefix` is already past the cursor.
         """
         # get matched key
         if len(prefix) == len(key):
-            if node.is_end:
+            # keys equal to or before the cursor are skipped
+            if node.is_end and after is None:
                 # yield the key and value
                 yield (prefix, node.value)
             return
@@ -213,16 +229,37 @@ class Trie(MutableMapping):
             # explore all children
             for index, child in enumerate(node.children):
                 if child is not None:
+                    child_after = self._child_after(after, index)
+                    if child_after is False:
+                        continue
                     char = key_to_character(index)
                     # yield from child nodes generator
-                    yield from self._wildcard_traverse(child, prefix + char, key)
+                    yield from self._wildcard_traverse(child, prefix + char, key, child_after)
         else:
             index = character_to_key(current_char)
             # get the matched child node
             child = node.children[index]
-            if child is not None:
+            child_after = self._child_after(after, index)
+            if child is not None and child_after is not False:
                 # yield from child nodes generator
-                yield from self._wildcard_traverse(child, prefix + current_char, key)
+                yield from self._wildcard_traverse(child, prefix + current_char, key, child_after)
+
+
+    @staticmethod
+    def _child_after(after: str | None, index: int) -> str | None | bool:
+        """
+        Helper function to advance the cursor remainder to the child at `index`.
+        Returns False if the whole child subtree comes before the cursor.
+        """
+        # already past the cursor, or the cursor is a prefix of every key below
+        if not after:
+            return None
+        cursor_index = character_to_key(after[0])
+        if index < cursor_index:
+            return False
+        if index == cursor_index:
+            return after[1:]
+        return None
 
 
     def autocomplete(self, prefix: str) -> list[str]:
@@ -238,3 +275,75 @@ class Trie(MutableMapping):
             node = child
         
         return [key for key, _ in self._traverse(node, prefix)]
+
+
+    def _find_node(self, prefix: str) -> TrieNode | None:
+        """
+        Helper function to return the node reached by following `prefix`, or None.
+        """
+        node = self.root
+        for char in prefix:
+            child = node.children[character_to_key(char)]
+            if child is None:
+                return None
+            node = child
+        return node
+
+
+    def count_prefix(self, prefix: str) -> int:
+        """
+        Return the number of keys in the trie that start with the given prefix,
+        without visiting them.
+        """
+        node = self._find_node(prefix)
+        return node.count if node is not None else 0
+
+
+    def rank(self, key: str) -> int:
+        """
+        Return the number of keys in the trie that come before `key` in alphabetical order.
+        `key` does not need to be in the trie.
+        """
+        node = self.root
+        rank = 0
+        for char in key:
+            # a key ending here is a prefix of `key`, so it comes first
+            if node.is_end:
+                rank += 1
+            index = character_to_key(char)
+            # every key under an earlier sibling comes first
+            for child in node.children[:index]:
+                if child is not None:
+                    rank += child.count
+            child = node.children[index]
+            if child is None:
+                return rank
+            node = child
+        return rank
+
+
+    def select(self, i: int) -> tuple[str, Any]:
+        """
+        Return the (key, value) pair at position `i` (0-based) in alphabetical order.
+
+        If `i` is out of range, raise `IndexError`.
+        """
+        if not 0 <= i < self.root.count:
+            raise IndexError(f"index {i} out of range for trie of size {self.root.count}")
+        
+        node = self.root
+        key = ""
+        while True:
+            if node.is_end:
+                if i == 0:
+                    return (key, node.value)
+                i -= 1
+            for index, child in enumerate(node.children):
+                if child is None:
+                    continue
+                # the key is in this child's subtree
+                if i < child.count:
+                    key += key_to_character(index)
+                    node = child
+                    break
+                i -= child.count
@@ -1,5 +1,7 @@
 from flask import Flask, render_template, request, jsonify
 from .crawler import build_index
+from itertools import islice
+import json
 import os
 import threading
 
@@ -7,25 +9,35 @@ app = Flask(__name__)
 
 # Global storage
 search_trie = None
+# near-duplicate URL -> canonical URL it was indexed under
+page_aliases = {}
 is_building = False
 build_status = "Ready"
 
 # Configuration
 current_config = {
     "url": os.getenv("URL", "https://example.com"),
-    "depth": int(os.getenv("DEPTH", 2))
+    "depth": int(os.getenv("DEPTH", 2)),
+    # max fingerprint bits apart for near-duplicate pages, None turns detection off
+    "dedup_distance": None if os.getenv("DEDUP_DISTANCE") == "off" else int(os.getenv("DEDUP_DISTANCE", 3))
 }
 
-def run_build_index(url, depth):
+# /search page size when no limit is given, and the largest one allowed
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 1000
+
+def run_build_index(url, depth, dedup_distance=3):
     """Background task to build index."""
-    global search_trie, is_building, build_status
+    global search_trie, page_aliases, is_building, build_status
     is_building = True
     build_status = f"Crawling {url} (Depth {depth})..."
     print(build_status)
     
     try:
-        new_trie = build_index(url, depth)
+        new_aliases = {}
+        new_trie = build_index(url, depth, new_aliases, dedup_distance)
         search_trie = new_trie
+        page_aliases = new_aliases
         build_status = "Index built successfully."
     except Exception as e:
         build_status = f"Error: {str(e)}"
@@ -45,7 +57,7 @@ def initialize_app():
 
     # If no index, build it
     if not is_building:
-        thread = threading.Thread(target=run_build_index, args=(current_config["url"], current_config["depth"]))
+        thread = threading.Thread(target=run_build_index, args=(current_config["url"], current_config["depth"], current_config["dedup_distance"]))
         thread.start()
 
 
@@ -74,13 +86,17 @@ def config():
 
         new_url = data.get("url")
         new_depth = int(data.get("depth", 2))
+        new_dedup = data.get("dedup_distance", current_config["dedup_distance"])
+        if new_dedup is not None and (not isinstance(new_dedup, int) or not 0 <= new_dedup <= 3):
+            return jsonify({"error": "dedup_distance must be an integer from 0 to 3, or null"}), 400
         
         if new_url:
             current_config["url"] = new_url
             current_config["depth"] = new_depth
+            current_config["dedup_distance"] = new_dedup
             
             # Start rebuild in background
-            thread = threading.Thread(target=run_build_index, args=(new_url, new_depth))
+            thread = threading.Thread(target=run_build_index, args=(new_url, new_depth, new_dedup))
             thread.start()
             
             return jsonify({"message": "Rebuild started", "config": current_config})
@@ -92,43 +108,98 @@ def config():
     })
 
 
+@app.route("/api/aliases")
+def aliases():
+    """
+    Return the canonical URL for `url`, or every near-duplicate alias if no URL is given.
+    """
+    url = request.args.get("url")
+    if url:
+        return jsonify({"url": url, "canonical": page_aliases.get(url, url)})
+    return jsonify(page_aliases)
+
+
 @app.route("/search")
 def search():
     """
-    Accepts query and returns JSON data.
+    Accepts query and returns one page of JSON data, serialized in chunks.
+
+    Optional pagination parameters:
+        limit  - Maximum number of words to return (default 100, at most 1000).
+        cursor - Last word of the previous page; only words after it are returned.
+
+    If more words follow this page, the `X-Next-Cursor` header holds the cursor for the next one.
     """
     query = request.args.get("query", "")
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE)
+    cursor = request.args.get("cursor") or None
     
     if not query or not search_trie:
         return jsonify([])
+    try:
+        limit = int(limit)
+    except ValueError:
+        return jsonify({"error": "limit must be a non-negative integer"}), 400
+    if limit < 0:
+        return jsonify({"error": "limit must be a non-negative integer"}), 400
+    limit = min(limit, MAX_PAGE_SIZE)
     
-    # get wildcard search results
-    results = list(search_trie.wildcard_search(query))
-    # sort by word
-    results.sort(key=lambda x: x[0])
+    # wildcard search already yields words in alphabetical order;
+    # take one extra match to learn whether another page follows, so the page
+    # (capped at MAX_PAGE_SIZE) is collected before the response starts
+    results = list(islice(search_trie.wildcard_search(query, after=cursor), limit + 1))
+    has_more = len(results) > limit
+    results = results[:limit]
     
-    # convert to JSON-friendly format
-    json_data = []
-    for word, urls in results:
-        json_data.append({
-            "word": word,
-            "urls": sorted(urls) # Sort URLs
-        })
+    def generate():
+        # serialize the JSON array one word at a time rather than as a single string
+        yield "["
+        for i, (word, urls) in enumerate(results):
+            item = {
+                "word": word,
+                "urls": sorted(urls) # Sort URLs
+            }
+            yield ("," if i else "") + json.dumps(item)
+        yield "]"
         
-    return jsonify(json_data)
+    response = app.response_class(generate(), mimetype="application/json")
+    if has_more and results:
+        response.headers["X-Next-Cursor"] = results[-1][0]
+    # upper bound on matches: keys sharing the pattern's literal prefix,
+    # left out when the pattern starts with '*' as it would be the whole index
+    literal_prefix = query.split("*", 1)[0]
+    if literal_prefix:
+        response.headers["X-Result-Estimate"] = str(search_trie.count_prefix(literal_prefix))
+    return response
 
 @app.route("/autocomplete")
 def autocomplete():
     """
     Accepts prefix and returns list of matching words.
+
+    Optional parameters:
+        offset - Number of matching words to skip.
     """
     prefix = request.args.get("q", "")
+    offset = request.args.get("offset", 0)
     
     if not prefix or not search_trie:
         return jsonify([])
+    try:
+        offset = int(offset)
+    except ValueError:
+        return jsonify({"error": "offset must be a non-negative integer"}), 400
+    if offset < 0:
+        return jsonify({"error": "offset must be a non-negative integer"}), 400
+    
+    # matches for a prefix are contiguous in alphabetical order,
+    # so pick the 10 words of this page by position without walking the rest
+    total = search_trie.count_prefix(prefix)
+    start = search_trie.rank(prefix)
+    results = [search_trie.select(start + i)[0] for i in range(offset, min(offset + 10, total))]
+    # echo the prefix as typed, since stored keys are lowercase with '_' for other characters
+    results = [prefix + word[len(prefix):] for word in results]
     
-    # get autocomplete results
-    results = search_trie.autocomplete(prefix)
-    # sort alphabetically and limit to 10
-    results.sort()
-    return jsonify(results[:10])
\ No newline at end of file
+    response = jsonify(results)
+    response.headers["X-Total-Count"] = str(total)
+    return response